@@ -1,7 +1,6 @@
-from database import get_db_connection
+from database import create_indexes, get_db_connection, read_sql_copy
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from sgp4.api import Satrec
 from datetime import datetime
 
@@ -9,23 +8,24 @@ from datetime import datetime
 def fetch_tle_bstar(norad_number=56851):
     conn = get_db_connection()
 
-    query = f"""
+    query = """
         SELECT epoch, tle_line1, tle_line2
         FROM satellite_tle_history
-        WHERE norad_number = {norad_number}
+        WHERE norad_number = %s
         ORDER BY epoch;
     """
-    tle_df = pd.read_sql(query, conn)
+    tle_df = read_sql_copy(query, conn, params=(norad_number,))
     conn.close()
 
     # ✅ Convert `epoch` to datetime
-    tle_df["epoch"] = pd.to_datetime(tle_df["epoch"])
+    tle_df["epoch"] = pd.to_datetime(tle_df["epoch"], format="ISO8601")  # COPY text omits zero fractional seconds
 
-    # ✅ Extract B* from TLE using SGP4 library
-    bstar_values = []
-    for _, row in tle_df.iterrows():
-        satrec = Satrec.twoline2rv(row["tle_line1"], row["tle_line2"])
-        bstar_values.append(satrec.bstar)  # Extract B* value
+    # ✅ Extract B* from TLE using SGP4 library (plain arrays, no per-row Series boxing)
+    lines1 = tle_df["tle_line1"].to_numpy()
+    lines2 = tle_df["tle_line2"].to_numpy()
+    bstar_values = np.empty(len(lines1), dtype=np.float64)
+    for i in range(len(lines1)):
+        bstar_values[i] = Satrec.twoline2rv(lines1[i], lines2[i]).bstar
 
     tle_df["bstar"] = bstar_values  # Add B* to dataframe
     return tle_df
@@ -40,27 +40,57 @@ def fetch_space_weather():
         FROM unified_space_weather
         ORDER BY epoch;
     """
-    weather_df = pd.read_sql(query, conn)
+    weather_df = read_sql_copy(query, conn)
     conn.close()
 
     # ✅ Convert `epoch` to datetime
-    weather_df["epoch"] = pd.to_datetime(weather_df["epoch"])
+    weather_df["epoch"] = pd.to_datetime(weather_df["epoch"], format="ISO8601")
     return weather_df
 
 
+# ✅ Index of the nearest sorted weather epoch for each TLE epoch (binary search on int64 ns)
+def nearest_epoch_index(weather_epochs, tle_epochs):
+    we = np.asarray(weather_epochs, dtype="datetime64[ns]").view("int64")
+    te = np.asarray(tle_epochs, dtype="datetime64[ns]").view("int64")
+    idx = np.searchsorted(we, te)
+    left = np.clip(idx - 1, 0, len(we) - 1)
+    right = np.clip(idx, 0, len(we) - 1)
+    pick_left = (te - we[left]) <= (we[right] - te)  # ties go to the earlier sample
+    return np.where(pick_left, left, right)
+
+
 # ✅ Match TLE Epochs to Nearest Space Weather Epochs
 def match_epochs(tle_df, weather_df):
-    tle_df["closest_weather_epoch"] = tle_df["epoch"].apply(
-        lambda x: weather_df.iloc[(weather_df["epoch"] - x).abs().idxmin()]["epoch"]
-    )
-    
-    # ✅ Merge TLE (B*) with Weather Data
-    matched_data = tle_df.merge(weather_df, left_on="closest_weather_epoch", right_on="epoch", suffixes=('_tle', '_weather'))
+    # ✅ Keep both epochs in the output (`epoch_tle` / `epoch_weather`) like a regular merge would
+    tle_sorted = tle_df.sort_values("epoch").rename(columns={"epoch": "epoch_tle"})
+    weather_sorted = weather_df.sort_values("epoch").rename(columns={"epoch": "epoch_weather"})
+
+    # ✅ Merge TLE (B*) with the nearest Weather sample in one sorted pass
+    try:
+        matched_data = pd.merge_asof(
+            tle_sorted,
+            weather_sorted,
+            left_on="epoch_tle",
+            right_on="epoch_weather",
+            direction="nearest",
+        )
+    except pd.errors.MergeError:
+        # ⚠️ Key dtypes merge_asof refuses (e.g. differing datetime resolution / timezone)
+        best = nearest_epoch_index(
+            weather_sorted["epoch_weather"].to_numpy(dtype="datetime64[ns]"),  # UTC for tz-aware columns
+            tle_sorted["epoch_tle"].to_numpy(dtype="datetime64[ns]"),
+        )
+        matched_data = pd.concat(
+            [tle_sorted.reset_index(drop=True), weather_sorted.iloc[best].reset_index(drop=True)],
+            axis=1,
+        )
     return matched_data
 
 
 # ✅ Plot B* vs Space Weather Metrics
 def plot_bstar_vs_weather(matched_data):
+    import matplotlib.pyplot as plt  # Imported lazily: only plotting needs it
+
     fig, axes = plt.subplots(3, 1, figsize=(10, 12), sharex=True)
 
     # ✅ Plot B* vs IMF Bz
@@ -104,6 +134,9 @@ def plot_bstar_vs_weather(matched_data):
 
 # ✅ Main Execution
 if __name__ == "__main__":
+    print("🔄 Ensuring read-path indexes exist...")
+    create_indexes()
+
     print("🔄 Fetching TLE data & extracting B* values...")
     tle_data = fetch_tle_bstar()
 
@@ -1,7 +1,9 @@
 import os
 import requests
+import requests_cache
 import psycopg2
 import time
+import concurrent.futures
 import pickle
 import pandas as pd
 from tqdm import tqdm
@@ -40,10 +42,28 @@ TLE_DIR = "tle_data"
 ORBIT_DIR = os.path.join(TLE_DIR, "iridium_active")
 DEORBITED_DIR = os.path.join(TLE_DIR, "iridium_inactive")
 os.makedirs(TLE_DIR, exist_ok=True)
+os.makedirs(ORBIT_DIR, exist_ok=True)
 os.makedirs(DEORBITED_DIR, exist_ok=True)
 
+# HTTP cache for Space-Track responses (identical queries within an hour are served locally)
+CACHE_NAME = "spacetrack_cache"
+CACHE_EXPIRE_AFTER = 3600  # seconds
+
+
+def is_cacheable(response):
+    """Only cache real TLE payloads, never empty bodies or Space-Track error pages."""
+    return bool(response.text.strip()) and "alert-danger" not in response.text
+
+
 # Initialize session
-session = requests.Session()
+session = requests_cache.CachedSession(
+    CACHE_NAME,
+    backend="sqlite",
+    expire_after=CACHE_EXPIRE_AFTER,
+    allowable_codes=(200,),
+    filter_fn=is_cacheable,
+)
+session.cache.delete(expired=True)  # Drop stale entries left over from earlier runs
 
 def save_cookies():
     """Saves cookies to a file."""
@@ -59,7 +79,8 @@ def load_cookies():
 def check_session_valid():
     """Tests if the saved session is still valid by pinging Space-Track."""
     test_url = "https://www.space-track.org/basicspacedata/query/class/satcat/limit/1"
-    response = session.get(test_url)
+    with session.cache_disabled():  # A cached 200 says nothing about the current cookies
+        response = session.get(test_url)
     
     if response.status_code == 200:
         print("✅ Session is still valid.")
@@ -109,8 +130,13 @@ def get_norad_ids():
 
 def get_all_from_csv():
     """Fetches all specifide satellite NORAD numbers from GpDat.csv."""
-    df = pd.read_csv(GP_DAT_FILE)
-    satellite_df = df[df["OBJECT_NAME"].str.contains("IRIDIUM", na=False, case=False)]
+    # ✅ Only parse the two columns we use
+    df = pd.read_csv(
+        GP_DAT_FILE,
+        usecols=["OBJECT_NAME", "NORAD_CAT_ID"],
+        dtype={"OBJECT_NAME": "string", "NORAD_CAT_ID": "int32"},
+    )
+    satellite_df = df[df["OBJECT_NAME"].str.contains("IRIDIUM", na=False, case=False, regex=False)]
     all_norad_ids = set(satellite_df["NORAD_CAT_ID"].astype(str))
 
     print(f"📄 Found {len(all_norad_ids)} Total Satellites in GpData.csv.")
@@ -122,6 +148,7 @@ def get_all_from_csv():
 def fetch_tle_data(norad_list, retry_attempts=5):
     """Fetches historical TLE data for a batch of NORADs, ensuring proper format handling.
        Handles connection errors gracefully and retries failed requests.
+       Returns (tle_text or None, served_from_cache).
     """
     for attempt in range(retry_attempts):
         norad_str = ",".join(norad_list)
@@ -143,17 +170,20 @@ def fetch_tle_data(norad_list, retry_attempts=5):
             # 🚨 Handle No Content (Empty Response)
             if response.status_code == 204 or len(response.text.strip()) == 0:
                 print(f"⚠️ No TLE data available for NORADs {norad_str}. Skipping.")
-                return None
+                return None, False
 
             # ❌ If session expired, force re-login
             if "alert-danger" in response.text or response.status_code in [401, 403]:
                 print("❌ Session expired or query error. Re-authenticating...")
                 login(force=True)
-                response = session.get(tle_url)
+                with session.cache_disabled():
+                    response = session.get(tle_url)
 
             if response.status_code == 200 and len(response.text.strip()) > 0:
-                print(f"✅ Successfully fetched TLE data for NORADs {norad_str}.")
-                return response.text.strip()
+                from_cache = getattr(response, "from_cache", False)
+                source = "cache" if from_cache else "Space-Track"
+                print(f"✅ Successfully fetched TLE data for NORADs {norad_str} (from {source}).")
+                return response.text.strip(), from_cache
 
         except (ConnectionError, Timeout) as e:
             print(f"❌ Connection error: {e}. Retrying in {5 + 2*attempt} seconds...")
@@ -164,7 +194,7 @@ def fetch_tle_data(norad_list, retry_attempts=5):
             sys.exit(1)
 
     print(f"❌ All retry attempts failed for NORADs {norad_str}. Skipping batch.")
-    return None
+    return None, False
 
 
 
@@ -186,15 +216,25 @@ def split_and_save_tle(tle_data, active_norads):
                 continue
 
             norad_id = line1.split()[1][:5]
-            tle_dict.setdefault(norad_id, []).append(f"{line1}\n{line2}")
+            # ✅ Drop repeated element sets: key on the epoch field (columns 19-32 of line 1)
+            seen_epochs, tle_blocks = tle_dict.setdefault(norad_id, (set(), []))
+            epoch_key = line1[18:32]
+            if epoch_key in seen_epochs:
+                continue
+            seen_epochs.add(epoch_key)
+            tle_blocks.append(f"{line1}\n{line2}")
 
-    for norad_id, tle_content in tle_dict.items():
+    for norad_id, (_, tle_content) in tle_dict.items():
         is_deorbited = norad_id not in active_norads
         folder = DEORBITED_DIR if is_deorbited else ORBIT_DIR
         filename = os.path.join(folder, f"tle_{norad_id}.txt")
 
-        with open(filename, "w") as file:
+        # ✅ One buffered write to a temp file, then an atomic rename: an interrupted run never
+        # leaves a truncated tle_*.txt that the skip check would treat as complete
+        tmp_filename = filename + ".tmp"
+        with open(tmp_filename, "w", buffering=1 << 20) as file:
             file.write("\n".join(tle_content) + "\n")
+        os.replace(tmp_filename, filename)
 
         print(f"📂 TLEs saved to {filename}")
 
@@ -210,21 +250,38 @@ norad_list = sorted(all_norads)
 BATCH_SIZE = 15
 WAIT_TIME = 60  # Base wait time in seconds
 
-with tqdm(total=len(norad_list), desc="📡 Downloading TLEs", unit=" batch") as pbar:
+# ✅ One directory scan up front instead of two stat() calls per NORAD per batch
+saved_files = {entry.name for entry in os.scandir(ORBIT_DIR)} | {entry.name for entry in os.scandir(DEORBITED_DIR)}
+
+# ✅ Splitting/saving runs on a background thread so it overlaps the rate-limit wait
+with tqdm(total=len(norad_list), desc="📡 Downloading TLEs", unit=" batch") as pbar, \
+        concurrent.futures.ThreadPoolExecutor(max_workers=1) as save_executor:
+    pending_save = None
     for i in range(0, len(norad_list), BATCH_SIZE):
         batch = norad_list[i:i+BATCH_SIZE]
 
-        if all(os.path.exists(os.path.join(ORBIT_DIR, f"tle_{norad}.txt")) or os.path.exists(os.path.join(DEORBITED_DIR, f"tle_{norad}.txt")) for norad in batch):
+        # ✅ Only request NORADs that don't have a TLE file yet
+        missing = [norad for norad in batch if f"tle_{norad}.txt" not in saved_files]
+        if not missing:
             pbar.update(BATCH_SIZE)
             continue
 
-        tle_data = fetch_tle_data(batch)
+        # Decided after the fetch: an entry can expire mid-run, and a re-login refetch goes to the API
+        tle_data, cached = fetch_tle_data(missing)
         if tle_data:
-            split_and_save_tle(tle_data, active_norads)
+            if pending_save is not None:
+                pending_save.result()  # Surface errors from the previous batch's save
+            pending_save = save_executor.submit(split_and_save_tle, tle_data, active_norads)
+
+        if cached:
+            pbar.update(BATCH_SIZE)
+            continue  # Served locally, no need to pace the API
 
         # ✅ Add randomness to the delay to avoid API detection
         random_wait = WAIT_TIME + random.randint(-10, 30)  # Wait between 50 - 90 sec
         print(f"⏳ Waiting {random_wait} seconds before next batch...")
         time.sleep(random_wait)
 
-        pbar.update(BATCH_SIZE)
\ No newline at end of file
+        pbar.update(BATCH_SIZE)
+    if pending_save is not None:
+        pending_save.result()
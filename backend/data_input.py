@@ -1,15 +1,15 @@
 import os
-import re
 import datetime
 import glob
 import time
 import concurrent.futures
-from math import sqrt
-from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer, Boolean, MetaData, Table, UniqueConstraint
-from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, insert
+from sqlalchemy import create_engine, text, Column, String, Float, DateTime, Integer, Boolean, MetaData, Table, UniqueConstraint
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
 from sqlalchemy.orm import sessionmaker
 import psycopg2
+from psycopg2.extras import execute_values
 from dotenv import load_dotenv
+import numpy as np
 from sgp4.api import Satrec
 from tqdm import tqdm
 
@@ -23,9 +23,9 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_PORT = os.getenv("DB_PORT", "5432")  # Ensure it's a string
 
-# Build connection string for SQLAlchemy
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
+# Build connection string for SQLAlchemy (psycopg2 driver: chunked_insert uses execute_values)
+DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+engine = None  # created by init_db() on first use, so pool workers never connect
 metadata = MetaData()
 
 # Define the Starlink TLE table with a unique constraint on (norad_id, epoch)
@@ -48,12 +48,28 @@ starlink_tle = Table(
     UniqueConstraint('norad_id', 'epoch', name='uix_norad_epoch')
 )
 
-# Uncomment the next line if you want to drop the existing table before recreating it.
-# metadata.drop_all(engine, [starlink_tle])
-metadata.create_all(engine)
+def init_db():
+    """
+    Create the engine and the starlink_tle table on first use; returns the engine.
+    """
+    global engine
+    if engine is None:
+        engine = create_engine(DATABASE_URL)
+        # Uncomment the next line if you want to drop the existing table before recreating it.
+        # metadata.drop_all(engine, [starlink_tle])
+        metadata.create_all(engine)
+    return engine
 
-# Precompile the NORAD ID regex to improve performance
-NORAD_REGEX = re.compile(r"1 (\d+)")
+# Multi-row INSERT for execute_values; records are dicts keyed by column name
+TLE_COLUMNS = (
+    "norad_id", "epoch", "tle_line1", "tle_line2", "altitude_km", "x", "y", "z",
+    "velocity_kms", "vx", "vy", "vz", "is_active"
+)
+INSERT_TLE_SQL = (
+    f"INSERT INTO starlink_tle ({', '.join(TLE_COLUMNS)}) VALUES %s "
+    "ON CONFLICT ON CONSTRAINT uix_norad_epoch DO NOTHING"
+)
+INSERT_TLE_TEMPLATE = "(" + ", ".join(f"%({col})s" for col in TLE_COLUMNS) + ")"
 
 def jday_to_datetime(jd, fr):
     """
@@ -64,156 +80,224 @@ def jday_to_datetime(jd, fr):
     timestamp = (jd_full - JD_UNIX_EPOCH) * 86400.0
     return datetime.datetime.utcfromtimestamp(timestamp)
 
-def fetch_existing_tles():
+def jday_array_to_datetime64(jd, fr):
     """
-    Fetch existing (norad_id, epoch) pairs from the database.
-    Updated for SQLAlchemy 2.0+ by passing columns as positional arguments.
+    Vectorized jday_to_datetime for NumPy arrays of jd / fr, returning datetime64[us].
+    Repeats the same float arithmetic and half-even microsecond rounding as
+    utcfromtimestamp, so epochs match the ones already stored in the database.
     """
-    with engine.begin() as conn:
-        result = conn.execute(
-            starlink_tle.select().with_only_columns(starlink_tle.c.norad_id, starlink_tle.c.epoch)
-        )
-        return set((row[0], row[1]) for row in result)
+    JD_UNIX_EPOCH = 2440587.5  # Julian Date for 1970-01-01
+    timestamp = (jd + fr - JD_UNIX_EPOCH) * 86400.0
+    seconds = np.trunc(timestamp)
+    micros = np.round((timestamp - seconds) * 1e6)
+    return (seconds.astype(np.int64) * 1_000_000 + micros.astype(np.int64)).view("datetime64[us]")
 
-def parse_tle_file(file_path, existing_tles=None):
+def norad_id_from_filename(file_path):
     """
-    Reads a TLE .txt file and yields parsed rows as dictionaries.
-    Assumes the file contains alternating TLE line 1 and line 2.
-    If propagation fails, derived fields are stored as None.
-    Skips computation if (norad_id, epoch) is already in existing_tles.
+    Return the NORAD ID encoded in a `tle_<norad>.txt` file name, or None.
     """
-    with open(file_path, 'r') as f:
-        # Using splitlines() for slightly better performance on large files
-        lines = f.read().splitlines()
-
-    if len(lines) % 2 != 0:
-        print(f"Warning: {file_path} has an odd number of lines. The last line will be ignored.")
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    if name.startswith("tle_") and name[4:].isdigit():
+        return int(name[4:])
+    return None
 
-    for i in range(0, len(lines) - 1, 2):
-        line1 = lines[i].strip()
-        line2 = lines[i+1].strip()
-        try:
-            # Extract NORAD ID early
-            match = NORAD_REGEX.search(line1)
-            if not match:
-                print(f"Warning: Could not extract NORAD ID from line: {line1}")
-                continue
-            norad_id = int(match.group(1))
-            
-            # Create satellite object and compute epoch
-            sat = Satrec.twoline2rv(line1, line2)
-            jd = sat.jdsatepoch
-            fr = sat.jdsatepochF
-            epoch = jday_to_datetime(jd, fr)
-            
-            # Skip if TLE already exists in DB
-            if existing_tles and (norad_id, epoch) in existing_tles:
-                continue
+def fetch_latest_epochs(norad_ids):
+    """
+    Return {norad_id: latest stored epoch (or None)} for the given NORAD IDs.
+    One round trip; each max(epoch) is answered from the uix_norad_epoch index,
+    so nothing proportional to the table size is pulled into memory.
+    """
+    if not norad_ids:
+        return {}
+    query = text("""
+        SELECT ids.norad_id,
+               (SELECT max(t.epoch) FROM starlink_tle t WHERE t.norad_id = ids.norad_id)
+        FROM unnest(CAST(:norad_ids AS integer[])) AS ids(norad_id)
+    """)
+    with init_db().begin() as conn:
+        result = conn.execute(query, {"norad_ids": list(norad_ids)})
+        return {row[0]: row[1] for row in result}
 
-            error_code, position, velocity = sat.sgp4(jd, fr)
-            if error_code != 0:
-                altitude = None
-                pos_components = [None, None, None]
-                vel_components = [None, None, None]
-                velocity_magnitude = None
-                # Log decayed TLE if desired
-                print(f"Info: TLE starting with {line1} flagged as decayed (error code {error_code}).")
-            else:
-                x, y, z = position
-                pos_components = [round(x, 4), round(y, 4), round(z, 4)]
-                r_norm = sqrt(x**2 + y**2 + z**2)
-                altitude = r_norm - 6371  # Earth's radius in km
-                vx, vy, vz = velocity
-                vel_components = [round(vx, 4), round(vy, 4), round(vz, 4)]
-                velocity_magnitude = round(sqrt(vx**2 + vy**2 + vz**2), 4)
-
-            yield {
-                "norad_id": norad_id,
-                "epoch": epoch,
-                "tle_line1": line1,
-                "tle_line2": line2,
-                "altitude_km": round(altitude, 2) if altitude is not None else None,
-                "x": pos_components[0],
-                "y": pos_components[1],
-                "z": pos_components[2],
-                "velocity_kms": velocity_magnitude,
-                "vx": vel_components[0],
-                "vy": vel_components[1],
-                "vz": vel_components[2]
-            }
-        except Exception as e:
-            print(f"Error parsing TLE pair starting at line {i+1} in {file_path}: {e}")
-            continue
+def iter_tle_pairs(f, file_path):
+    """
+    Yield (line1, line2) pairs from an open TLE file, one pair at a time.
+    """
+    it = iter(f)
+    for line1 in it:
+        line2 = next(it, None)
+        if line2 is None:
+            print(f"Warning: {file_path} has an odd number of lines. The last line will be ignored.")
+            break
+        yield line1.strip(), line2.strip()
 
-def chunked_insert(records, chunk_size=100, max_retries=3, retry_delay=5):
+def parse_tle_file(file_path, latest_epoch=None):
     """
-    Insert the records in chunks using ON CONFLICT ON CONSTRAINT to skip duplicates.
-    If a chunk fails, it retries up to max_retries with a delay.
+    Reads a TLE .txt file and returns the parsed rows as a list of dictionaries.
+    Skips TLEs at or before latest_epoch; if propagation fails, derived fields are None.
     """
-    for i in tqdm(range(0, len(records), chunk_size), desc="Inserting chunks"):
-        chunk = records[i:i+chunk_size]
-        stmt = insert(starlink_tle).values(chunk)
-        # Use ON CONFLICT on the unique constraint 'uix_norad_epoch'
-        stmt = stmt.on_conflict_do_nothing(constraint='uix_norad_epoch')
-        attempts = 0
-        while attempts < max_retries:
+    tles = []  # (norad_id, line1, line2) -- the Satrec itself is not kept
+    jds, frs, errors, positions, velocities = [], [], [], [], []
+    with open(file_path, 'r') as f:
+        # Stream the file two lines at a time instead of materializing every line
+        for i, (line1, line2) in enumerate(iter_tle_pairs(f, file_path)):
             try:
-                with engine.begin() as conn:
-                    conn.execute(stmt)
-                break
+                # TLE lines are fixed-width: line numbers in column 1, NORAD ID in columns 3-7
+                if line1[:1] != '1' or line2[:1] != '2':
+                    print(f"Warning: Could not extract NORAD ID from line: {line1}")
+                    continue
+                norad_id = int(line1[2:7])
+
+                # Create satellite object and propagate it to its own epoch right away.
+                # SatrecArray evaluates the full satellites x dates grid, so one C call each.
+                sat = Satrec.twoline2rv(line1, line2)
+                error, position, velocity = sat.sgp4(sat.jdsatepoch, sat.jdsatepochF)
             except Exception as e:
-                attempts += 1
-                print(f"Error inserting chunk {i} to {i+len(chunk)-1} (attempt {attempts}): {e}")
-                time.sleep(retry_delay)
+                print(f"Error parsing TLE pair starting at line {2*i+1} in {file_path}: {e}")
+                continue
+            tles.append((norad_id, line1, line2))
+            jds.append(sat.jdsatepoch)
+            frs.append(sat.jdsatepochF)
+            errors.append(error)
+            positions.append(position)
+            velocities.append(velocity)
+
+    if not tles:
+        return []
+
+    # Compute all epochs in one NumPy pass
+    epochs = jday_array_to_datetime64(np.array(jds), np.array(frs))
+    errors = np.array(errors)
+    positions = np.array(positions)
+    velocities = np.array(velocities)
+
+    # Skip TLEs already in DB
+    if latest_epoch is not None:
+        fresh = epochs > np.datetime64(latest_epoch, "us")
+        if not fresh.any():
+            return []
+        tles = [tle for tle, keep in zip(tles, fresh) if keep]
+        epochs, errors, positions, velocities = epochs[fresh], errors[fresh], positions[fresh], velocities[fresh]
+    epochs = epochs.tolist()  # datetime objects for the DB driver
+
+    # Row-wise squared norms in a single pass each; full precision is stored (DOUBLE PRECISION),
+    # rounding is left to presentation
+    altitudes = (np.sqrt(np.einsum('ij,ij->i', positions, positions)) - 6371.0).tolist()  # Earth's radius in km
+    speeds = np.sqrt(np.einsum('ij,ij->i', velocities, velocities)).tolist()
+    positions = positions.tolist()
+    velocities = velocities.tolist()
+
+    records = []
+    for k, ((norad_id, line1, line2), epoch) in enumerate(zip(tles, epochs)):
+        if errors[k] != 0:
+            altitude = None
+            pos_components = [None, None, None]
+            vel_components = [None, None, None]
+            velocity_magnitude = None
+            # Log decayed TLE if desired
+            print(f"Info: TLE starting with {line1} flagged as decayed (error code {errors[k]}).")
         else:
-            print(f"Failed to insert chunk {i} to {i+len(chunk)-1} after {max_retries} attempts.")
+            altitude = altitudes[k]
+            pos_components = positions[k]
+            vel_components = velocities[k]
+            velocity_magnitude = speeds[k]
+
+        records.append({
+            "norad_id": norad_id,
+            "epoch": epoch,
+            "tle_line1": line1,
+            "tle_line2": line2,
+            "altitude_km": altitude,
+            "x": pos_components[0],
+            "y": pos_components[1],
+            "z": pos_components[2],
+            "velocity_kms": velocity_magnitude,
+            "vx": vel_components[0],
+            "vy": vel_components[1],
+            "vz": vel_components[2]
+        })
+    return records
 
-def insert_tle_file_to_db(file_path, is_active=True, existing_tles=None):
+def chunked_insert(records, chunk_size=2000, max_retries=3, retry_delay=5):
     """
-    Parses a TLE file and inserts its entries into the starlink_tle table using chunked inserts.
+    Insert the records in chunks in a single transaction, skipping duplicates via ON CONFLICT.
+    The transaction is retried up to max_retries with a delay, then the error is raised.
+    """
+    attempts = 0
+    while True:
+        try:
+            conn = init_db().raw_connection()  # pooled psycopg2 connection
+            try:
+                with conn.cursor() as cur:
+                    for i in tqdm(range(0, len(records), chunk_size), desc="Inserting chunks"):
+                        chunk = records[i:i+chunk_size]
+                        execute_values(cur, INSERT_TLE_SQL, chunk, template=INSERT_TLE_TEMPLATE, page_size=chunk_size)
+                conn.commit()
+            finally:
+                conn.close()  # returned to the pool; uncommitted work is rolled back
+            return
+        except Exception as e:
+            attempts += 1
+            print(f"Error inserting {len(records)} records (attempt {attempts}): {e}")
+            if attempts >= max_retries:
+                raise
+            time.sleep(retry_delay)
+
+def insert_tle_records(parsed_tles, file_path, is_active=True):
+    """
+    Inserts already parsed TLE records of one file into the starlink_tle table.
     Adds the is_active flag based on which folder the file came from.
     """
-    parsed_tles = list(parse_tle_file(file_path, existing_tles))
     if not parsed_tles:
         print(f"No valid TLE records found in {file_path}")
         return
     for record in parsed_tles:
         record["is_active"] = is_active
-    chunked_insert(parsed_tles, chunk_size=100)
+    chunked_insert(parsed_tles)
     print(f"✅ Inserted {len(parsed_tles)} TLE records from {os.path.basename(file_path)} (is_active={is_active})")
 
-def batch_insert_tle_from_directory(directory_path, is_active=True, max_workers=4, existing_tles=None):
+def insert_tle_file_to_db(file_path, is_active=True):
+    """
+    Parses a TLE file and inserts its entries into the starlink_tle table using chunked inserts.
+    """
+    norad_id = norad_id_from_filename(file_path)
+    latest_epoch = fetch_latest_epochs([norad_id]).get(norad_id) if norad_id is not None else None
+    insert_tle_records(parse_tle_file(file_path, latest_epoch), file_path, is_active)
+
+def batch_insert_tle_from_directory(directory_path, is_active=True, max_workers=None):
     """
     Iterates over every .txt file in the given directory and inserts the TLE data into the database.
-    Files are processed concurrently using a thread pool.
+    Parsing and SGP4 propagation are CPU-bound, so files are parsed in a process pool
+    (one worker per core by default); inserts run in this process as results arrive.
     """
     txt_files = glob.glob(os.path.join(directory_path, "*.txt"))
     if not txt_files:
         print(f"No .txt files found in {directory_path}")
         return
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Schedule all file insertions concurrently
+    # Newest stored epoch per satellite, so workers only propagate new TLEs
+    file_norads = {file_path: norad_id_from_filename(file_path) for file_path in txt_files}
+    latest_epochs = fetch_latest_epochs([n for n in file_norads.values() if n is not None])
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:  # None -> os.cpu_count()
+        # Schedule all file parses concurrently
         futures = {
-            executor.submit(insert_tle_file_to_db, file_path, is_active, existing_tles): file_path 
+            executor.submit(parse_tle_file, file_path, latest_epochs.get(file_norads[file_path])): file_path
             for file_path in txt_files
         }
         for future in tqdm(concurrent.futures.as_completed(futures), total=len(futures), desc="Processing files"):
+            file_path = futures[future]
             try:
-                future.result()
+                insert_tle_records(future.result(), file_path, is_active)
             except Exception as exc:
-                print(f"File {futures[future]} generated an exception: {exc}")
+                print(f"File {file_path} generated an exception: {exc}")
 
 if __name__ == "__main__":
     # Paths to the active and inactive directories
     active_dir = "tle_data/starlink_active"
     inactive_dir = "tle_data/starlink_inactive"
 
-    print("🔍 Fetching existing TLE entries from DB...")
-    existing_tles = fetch_existing_tles()
-
     print("Processing active Starlink TLE files...")
-    batch_insert_tle_from_directory(active_dir, is_active=True, max_workers=10, existing_tles=existing_tles)
+    batch_insert_tle_from_directory(active_dir, is_active=True)
 
     print("Processing inactive Starlink TLE files...")
-    batch_insert_tle_from_directory(inactive_dir, is_active=False, max_workers=10, existing_tles=existing_tles)
+    batch_insert_tle_from_directory(inactive_dir, is_active=False)
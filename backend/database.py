@@ -1,8 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
+import io
 import os
 import pandas as pd
-import seaborn as sn
 import psycopg2
 # ✅ Load environment variables
 load_dotenv()
@@ -14,30 +14,89 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_PORT = os.getenv("DB_PORT", "5432")  # Ensure it's a string
 
+# ✅ One pooled engine for the whole process (connections are opened lazily and reused)
+DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ENGINE = create_engine(DATABASE_URL, pool_size=5, max_overflow=10, pool_pre_ping=True)
 
 
 # 🔹 Database Connection Function
 def get_db_connection():
-    """Connect to PostgreSQL and return the connection object."""
-    return psycopg2.connect(
-        host=DB_HOST,
-        database=DB_NAME,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        port=5432
-    )
+    """
+    Return a psycopg2 connection checked out from the shared pool.
+    `close()` hands it back to the pool instead of tearing down the TCP session.
+    """
+    return ENGINE.raw_connection()
+
+
+# ✅ Indexes behind the ordered reads in DataCleaning.py. Expected plans once they exist:
+#   fetch_tle_bstar     -> Index Only Scan using idx_tle_history_norad_epoch (no Sort node,
+#                          TLE lines come from the index via INCLUDE, no heap fetch per row)
+#   fetch_space_weather -> Index Scan using idx_space_weather_epoch (no Sort node)
+INDEX_DDL = {
+    "idx_tle_history_norad_epoch": """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tle_history_norad_epoch
+    ON satellite_tle_history (norad_number, epoch) INCLUDE (tle_line1, tle_line2)
+    """,
+    "idx_space_weather_epoch": """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_space_weather_epoch
+    ON unified_space_weather (epoch)
+    """,
+}
+
+
+def index_is_invalid(conn, index_name):
+    """True if the index exists but is marked INVALID (left behind by a failed CONCURRENTLY build)."""
+    return bool(conn.execute(
+        text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": index_name},
+    ).scalar())
+
 
+def drop_invalid_index(conn, index_name):
+    """Drop the index if it is INVALID, so the next CREATE ... IF NOT EXISTS rebuilds it."""
+    if index_is_invalid(conn, index_name):
+        print(f"⚠️ Dropping invalid index {index_name}")
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
 
 
+def create_indexes():
+    """Create the read-path indexes if missing, without locking writers (idempotent)."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with ENGINE.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for index_name, ddl in INDEX_DDL.items():
+            try:
+                # IF NOT EXISTS would otherwise skip a broken index from an earlier run forever
+                drop_invalid_index(conn, index_name)
+                conn.execute(text(ddl))
+            except Exception as e:
+                print(f"⚠️ Could not create index {index_name}: {e}")
+                try:
+                    drop_invalid_index(conn, index_name)
+                except Exception as drop_error:
+                    print(f"⚠️ Could not drop invalid index {index_name}: {drop_error}")
+
+
+def read_sql_copy(query, conn, params=None, parse_dates=None, **read_csv_kwargs):
+    """
+    Run a SELECT through `COPY (...) TO STDOUT` and load the CSV stream with pandas.
+    `params` fill `%s` placeholders; extra kwargs go to `pd.read_csv`.
+    """
+    buffer = io.StringIO()
+    with conn.cursor() as cur:
+        if params is not None:
+            query = cur.mogrify(query, params).decode()
+        # Newlines keep trailing `--` comments in the query from swallowing the closing paren
+        copy_sql = f"COPY (\n{query.strip().rstrip(';')}\n) TO STDOUT WITH CSV HEADER"
+        cur.copy_expert(copy_sql, buffer)
+    buffer.seek(0)
+    if parse_dates:
+        read_csv_kwargs.setdefault("date_format", "ISO8601")  # COPY text omits zero fractional seconds
+    return pd.read_csv(buffer, parse_dates=parse_dates, **read_csv_kwargs)
+
 
 def get_db_engine():
-    try:
-        engine = create_engine(f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}")
-        print("✅ Database connection established successfully!")
-        return engine
-    except Exception as e:
-        print(f"❌ Database connection failed: {e}")
-        return None
+    """Return the shared pooled SQLAlchemy engine."""
+    return ENGINE
     
 def fetch_satellite_data():
     """
@@ -56,7 +115,11 @@ def fetch_satellite_data():
         ORDER BY norad_number, epoch ASC  -- ✅ Sort to maintain time-series order
     """
 
-    df = pd.read_sql(query, engine)  # ✅ Use SQLAlchemy engine
-    engine.dispose()  # Close connection when done
+    conn = engine.raw_connection()  # ✅ psycopg2 connection behind the SQLAlchemy engine
+    try:
+        # ✅ Arrow-backed columns: about half the memory of object/float64 blocks
+        df = read_sql_copy(query, conn, parse_dates=["epoch"], dtype_backend="pyarrow")
+    finally:
+        conn.close()
 
     return df
\ No newline at end of file
@@ -1,10 +1,14 @@
 import os
 import glob
-import io
+import mmap
+import struct
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import psycopg2
+import threading
 import concurrent.futures
-from sqlalchemy import create_engine, inspect
 from dotenv import load_dotenv
 from tqdm import tqdm
 
@@ -18,12 +22,8 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_PORT = os.getenv("DB_PORT", "5432")  # Ensure it's a string
 
-# Create SQLAlchemy engine for schema/table inspection
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
-
 def get_psycopg2_connection():
-    """Create a psycopg2 connection for COPY operations."""
+    """Create a psycopg2 connection for COPY and staging operations."""
     return psycopg2.connect(
         dbname=DB_NAME,
         user=DB_USER,
@@ -63,102 +63,415 @@ na_values = [
     "9999999", " 9999999"
 ]
 
-def fetch_existing_epochs():
+# Narrow integer dtypes for the time components (used when a column has no NAs and every value fits)
+narrow_int_dtypes = {"Year": np.int16, "Day": np.int16, "Hour": np.int8, "Minute": np.int8}
+
+# Byte layout of a data row, computed once at import for the byte-slice reader
+col_offsets = np.cumsum([0] + col_widths)
+col_spans = [(name, int(start), int(end)) for name, start, end in zip(col_names, col_offsets[:-1], col_offsets[1:])]
+row_width = int(col_offsets[-1])
+na_bytes = np.array(sorted({v.strip().encode() for v in na_values}))
+na_floats = np.array(sorted({float(v) for v in na_values}))  # read_fwf also nulls "9999.0", "99999."
+
+def fetch_latest_epoch(table_name="omni_data"):
     """
-    Return a set of epoch values already in 'omni_data'.
+    Return the newest epoch stored in the table (None if it is empty or missing).
+    A single scalar instead of the whole epoch column.
     """
-    insp = inspect(engine)
-    if not insp.has_table("omni_data"):
-        return set()
-    df_existing = pd.read_sql("SELECT \"epoch\" FROM \"omni_data\"", engine, parse_dates=["epoch"])
-    return set(df_existing["epoch"])
+    with get_psycopg2_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass(%s)", (f'"{table_name}"',))
+            if cur.fetchone()[0] is None:
+                return None
+            cur.execute(f'SELECT max("epoch") FROM "{table_name}"')
+            return cur.fetchone()[0]
 
-def parse_single_file(file_path, skiprows=20):
-    """Parse one OMNI file into a DataFrame."""
-    temp_df = pd.read_fwf(
-        file_path,
-        widths=col_widths,
-        names=col_names,
-        header=None,
-        skiprows=skiprows,
-        na_values=na_values,
-        keep_default_na=True
+def read_fixed_width_columns(file_path, skiprows=20):
+    """
+    Decode every column of a fixed-width OMNI file from its byte slice of an mmap'd buffer.
+    Returns {column name: ndarray}: integer columns without NAs as ints, the rest float64.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            rows = np.empty((0, row_width), dtype=np.uint8)
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                body_start = 0
+                for _ in range(skiprows):
+                    newline = buf.find(b"\n", body_start)
+                    body_start = len(buf) if newline < 0 else newline + 1
+                body = np.frombuffer(buf, dtype=np.uint8, offset=body_start)
+                line_len = buf.find(b"\n", body_start) - body_start + 1
+                if (
+                    line_len > row_width
+                    and len(body) % line_len == 0
+                    and (body.reshape(-1, line_len)[:, -1] == ord("\n")).all()
+                ):
+                    # Fast path: every line has the same length -> zero-copy 2-D view
+                    rows = body.reshape(-1, line_len)[:, :row_width].copy()
+                else:
+                    # Ragged lines (trimmed trailing blanks, blank tail): pad each line to row_width
+                    lines = [line for line in bytes(body).splitlines() if line.strip()]
+                    rows = np.array(lines, dtype=f"S{row_width}").view(np.uint8).reshape(-1, row_width)
+                    rows = np.where(rows == 0, ord(" "), rows).astype(np.uint8)
+                del body  # release the buffer export before the mmap closes
+
+    columns = {}
+    for name, start, end in col_spans:
+        raw = np.ascontiguousarray(rows[:, start:end])
+        fields = raw.view(f"S{end - start}").ravel()  # NumPy's number parsing skips the padding
+        # NA sentinels and their numerically equal spellings ("9999.0", "999.90") use only
+        # ' ', '0', '9' and '.': one pass over the bytes finds the candidates, and only
+        # those are checked (a real value such as SYM_H = 9 must survive).
+        candidates = np.all(
+            (raw == ord(" ")) | (raw == ord("0")) | (raw == ord("9")) | (raw == ord(".")), axis=1
+        )
+        is_na = np.zeros(len(fields), dtype=bool)
+        if candidates.any():
+            stripped = np.char.strip(fields[candidates])
+            candidate_na = np.isin(stripped, na_bytes) | (stripped == b"")
+            candidate_na[~candidate_na] = np.isin(stripped[~candidate_na].astype(np.float64), na_floats)
+            is_na[candidates] = candidate_na
+        if not is_na.any() and not (raw == ord(".")).any():
+            values = fields.astype(np.int64)
+            # Narrow only when every value fits; an out-of-range Hour such as 999 stays
+            # int64 so build_epochs can turn that row into NaT instead of failing the file
+            narrow = narrow_int_dtypes.get(name)
+            if narrow is not None and len(values):
+                info = np.iinfo(narrow)
+                if info.min <= values.min() and values.max() <= info.max:
+                    values = values.astype(narrow)
+            columns[name] = values
+        else:
+            columns[name] = np.where(is_na, b"nan", fields).astype(np.float64)
+    return columns
+
+def build_epochs(year, day, hour, minute):
+    """
+    Vectorized `Year DOY HH:MM` -> datetime64[ns] using datetime64/timedelta64 arithmetic
+    (no per-row string formatting or strptime). Missing or out-of-range parts give NaT.
+    """
+    year, day, hour, minute = (np.asarray(a, dtype=np.float64) for a in (year, day, hour, minute))
+    valid = (
+        (year >= 1) & (day >= 1) & (day <= 366) &
+        (hour >= 0) & (hour < 24) & (minute >= 0) & (minute < 60)
     )
-    # Construct the epoch column
-    temp_df["epoch"] = pd.to_datetime(
-        temp_df["Year"].astype(str) + " " +
-        temp_df["Day"].astype(str) + " " +
-        temp_df["Hour"].astype(str) + ":" +
-        temp_df["Minute"].astype(str),
-        format="%Y %j %H:%M",
-        errors="coerce"
+    year, day, hour, minute = (np.where(valid, a, 1).astype(np.int64) for a in (year, day, hour, minute))
+    epochs = (
+        (year - 1970).astype("datetime64[Y]").astype("datetime64[ns]")
+        + (day - 1).astype("timedelta64[D]")
+        + hour.astype("timedelta64[h]")
+        + minute.astype("timedelta64[m]")
     )
-    temp_df.dropna(subset=["epoch"], inplace=True)
-    return temp_df
+    epochs[~valid] = np.datetime64("NaT")
+    return epochs
+
+# Stored in each .parquet cache; bump whenever the parser's output changes so stale caches are rebuilt
+OMNI_CACHE_VERSION = "3"
+
+def parse_single_file(file_path, skiprows=20):
+    """
+    Parse one OMNI file into a pyarrow Table, reusing the <file>.parquet cache when valid.
+    """
+    cache_path = file_path + ".parquet"
+    cache_key = {b"omni_cache_version": OMNI_CACHE_VERSION.encode(), b"skiprows": str(skiprows).encode()}
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(file_path):
+        try:
+            metadata = pq.read_schema(cache_path).metadata or {}
+            if all(metadata.get(key) == value for key, value in cache_key.items()):
+                return pq.read_table(cache_path).replace_schema_metadata(None)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable cache {cache_path}: {e}")
+
+    columns = read_fixed_width_columns(file_path, skiprows=skiprows)
+    # Construct the epoch column
+    epochs = build_epochs(columns["Year"], columns["Day"], columns["Hour"], columns["Minute"])
+    valid = ~np.isnat(epochs)
+    columns["epoch"] = epochs
+    table = pa.table({name: values[valid] for name, values in columns.items()})
+
+    # Write to a temp file and rename so a crashed run never leaves a truncated cache
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        pq.write_table(table.replace_schema_metadata(cache_key), tmp_path, compression="zstd")
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️ Could not write cache {cache_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return table
 
 def load_omni_data(omni_folder):
     """
-    Parse all OMNI files concurrently, merge, deduplicate, and sort by epoch.
+    Parse all OMNI files concurrently and concatenate them in file (epoch) order.
     """
-    file_paths = glob.glob(os.path.join(omni_folder, "OMNI_*.lst"))
+    file_paths = sorted(glob.glob(os.path.join(omni_folder, "OMNI_*.lst")))
     if not file_paths:
         print(f"No OMNI .lst files found in {omni_folder}")
         return pd.DataFrame()
 
-    df_list = []
-    with concurrent.futures.ThreadPoolExecutor() as executor:
+    tables = {}
+    errors = []
+    # Parsing is CPU-bound, so use processes; leave one core for the main process
+    max_workers = max(1, (os.cpu_count() or 1) - 1)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
         futures = {executor.submit(parse_single_file, fp): fp for fp in file_paths}
-        for future in tqdm(concurrent.futures.as_completed(futures), total=len(futures), desc="Parsing files"):
+        # Redraw at most once a second instead of on every completed file
+        for future in tqdm(concurrent.futures.as_completed(futures), total=len(futures),
+                           desc="Parsing files", mininterval=1.0, smoothing=0.05):
             path = futures[future]
             try:
-                df_part = future.result()
-                df_list.append(df_part)
+                tables[path] = future.result()
             except Exception as exc:
-                print(f"Error parsing {path}: {exc}")
+                errors.append((path, exc))
+
+    if errors:
+        print(f"⚠️ Failed to parse {len(errors)} of {len(file_paths)} files:")
+        for path, exc in sorted(errors, key=lambda e: e[0]):
+            print(f"  {path}: {exc}")
 
-    if not df_list:
+    if not tables:
         return pd.DataFrame()
 
-    combined_df = pd.concat(df_list, ignore_index=True)
-    combined_df.drop_duplicates(subset=["epoch"], inplace=True)
-    
-    # reorder columns: epoch first
-    cols = ["epoch"] + [c for c in combined_df.columns if c != "epoch"]
-    combined_df = combined_df[cols]
-    combined_df.sort_values("epoch", inplace=True)
-    return combined_df
+    # Zero-copy concat into chunked columns; "permissive" widens a column that is
+    # int64 in one file and float64 (has NAs) in another, as pd.concat would
+    combined = pa.concat_tables(
+        [tables[fp] for fp in file_paths if fp in tables], promote_options="permissive"
+    )
+    # Column order is left as parsed; copy_using_psycopg2 puts epoch first in the COPY
+    return combined.to_pandas()
+
+# PostgreSQL binary COPY: type OID -> big-endian NumPy dtype of the field payload
+PG_BINARY_TYPES = {
+    701: ">f8",   # double precision
+    700: ">f4",   # real
+    20: ">i8",    # bigint
+    23: ">i4",    # integer
+    21: ">i2",    # smallint
+    1114: ">i8",  # timestamp without time zone: microseconds since 2000-01-01
+}
+PG_TIMESTAMP_OID = 1114
+PG_EPOCH = np.datetime64("2000-01-01T00:00:00", "us")
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)  # signature, flags, no extension
+PGCOPY_TRAILER = struct.pack(">h", -1)
+
+def fetch_column_types(cur, table_name, columns, setup_sql=""):
+    """
+    Return the PostgreSQL type OIDs of the given table columns (no rows are read).
+    `setup_sql` is sent in the same round trip, ahead of the probe query.
+    """
+    columns_str = ", ".join(f'"{col}"' for col in columns)
+    cur.execute(f'{setup_sql}\nSELECT {columns_str} FROM "{table_name}" LIMIT 0;')
+    return [desc.type_code for desc in cur.description]
 
-def copy_using_psycopg2(df, table_name="omni_data"):
+def encode_binary_rows(df, type_oids, columns=None):
     """
-    Bulk-load the DataFrame into PostgreSQL using psycopg2 COPY command,
-    quoting all column identifiers to match the table's quoted uppercase columns.
+    Encode DataFrame rows as PGCOPY binary tuples (without header/trailer),
+    fields in `columns` order (default: df.columns).
     """
-    # Convert the DataFrame to in-memory CSV
-    output = io.StringIO()
-    df.to_csv(output, sep=",", header=False, index=False)
-    output.seek(0)
+    n = len(df)
+    dtypes = [np.dtype(PG_BINARY_TYPES[oid]) for oid in type_oids]
+    row_bytes = 2 + sum(4 + dt.itemsize for dt in dtypes)
+    out = np.empty((n, row_bytes), dtype=np.uint8)
+    keep = np.ones((n, row_bytes), dtype=bool)
+    out[:, :2] = np.frombuffer(struct.pack(">h", len(dtypes)), dtype=np.uint8)
+
+    pos = 2
+    for col, oid, dt in zip(df.columns if columns is None else columns, type_oids, dtypes):
+        series = df[col]
+        if oid == PG_TIMESTAMP_OID:
+            stamps = series.to_numpy(dtype="datetime64[us]")
+            null = np.isnat(stamps)
+            payload = np.where(null, PG_EPOCH, stamps) - PG_EPOCH
+        elif series.dtype.kind in "iub":
+            payload = series.to_numpy()
+            null = np.zeros(n, dtype=bool)
+        else:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            null = np.isnan(values)
+            payload = np.where(null, 0.0, values)
+            if dt.kind == "i" and not np.array_equal(payload, np.trunc(payload)):
+                raise ValueError(f"Column {col!r} has non-integer values for an integer column")
+        size = dt.itemsize
+        lengths = np.where(null, -1, size).astype(">i4")
+        out[:, pos:pos + 4] = lengths.view(np.uint8).reshape(n, 4)
+        out[:, pos + 4:pos + 4 + size] = payload.astype(dt).view(np.uint8).reshape(n, size)
+        keep[:, pos + 4:pos + 4 + size] = ~null[:, None]
+        pos += 4 + size
+    return out[keep].tobytes() if not keep.all() else out.tobytes()
+
+class DataFrameCSVStream:
+    """
+    Read-only file-like object that renders a DataFrame as CSV lazily for COPY.
+    Only `chunk_rows` rows are formatted at a time, so peak memory is one chunk
+    of CSV text instead of the whole table.
+    """
+    header = ""
+    trailer = ""
+
+    def __init__(self, df, columns=None, chunk_rows=50_000):
+        self.df = df
+        self.columns = list(df.columns) if columns is None else list(columns)
+        self.chunk_rows = chunk_rows
+        self._empty = self.header[:0]  # "" for CSV, b"" for binary
+        self._chunks = self._iter_chunks()
+        self._chunk = self._empty
+        self._offset = 0
+
+    def _render(self, chunk_df):
+        return chunk_df.to_csv(sep=",", header=False, index=False, columns=self.columns)
+
+    def _iter_chunks(self):
+        if self.header:
+            yield self.header
+        for start in range(0, len(self.df), self.chunk_rows):
+            yield self._render(self.df.iloc[start:start + self.chunk_rows])
+        if self.trailer:
+            yield self.trailer
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = self._chunk[self._offset:] + self._empty.join(self._chunks)
+            self._chunk, self._offset = self._empty, 0
+            return data
+        while self._offset >= len(self._chunk):
+            self._chunk = next(self._chunks, None)
+            self._offset = 0
+            if self._chunk is None:
+                self._chunk = self._empty
+                return self._empty
+        data = self._chunk[self._offset:self._offset + size]
+        self._offset += len(data)
+        return data
+
+class DataFrameBinaryStream(DataFrameCSVStream):
+    """Same as DataFrameCSVStream, but emits PostgreSQL's binary COPY format."""
+    header = PGCOPY_HEADER
+    trailer = PGCOPY_TRAILER
+
+    def __init__(self, df, type_oids, columns=None, chunk_rows=50_000):
+        self.type_oids = type_oids
+        super().__init__(df, columns=columns, chunk_rows=chunk_rows)
+
+    def _render(self, chunk_df):
+        return encode_binary_rows(chunk_df, self.type_oids, self.columns)
 
+def copy_shard(df, table_name="omni_data", columns=None, before_commit=None):
+    """
+    COPY one DataFrame into a TEMP staging table and merge it, skipping existing epochs.
+    `before_commit` may raise to roll back. Returns the number of rows inserted.
+    """
+    if columns is None:
+        columns = ["epoch"] + [c for c in df.columns if c != "epoch"]
+    staging_table = f"tmp_{table_name}"
     # QUOTE each column name to match your DB's "Year", "Day" ...
-    columns_str = ", ".join(f'"{col}"' for col in df.columns)
+    columns_str = ", ".join(f'"{col}"' for col in columns)
+    staged_columns_str = ", ".join(f't."{col}"' for col in columns)
 
     with get_psycopg2_connection() as conn:
         conn.autocommit = False
         with conn.cursor() as cur:
-            copy_sql = f"""
-                COPY "{table_name}" ({columns_str})
-                FROM STDIN
-                WITH (
-                    FORMAT CSV,
-                    DELIMITER ',',
-                    NULL ''
-                );
-            """
             try:
-                cur.copy_expert(copy_sql, output)
+                # TEMP tables are never WAL-logged and vanish at commit; created in the
+                # same round trip as the column-type probe. The load is re-runnable, so
+                # this transaction doesn't wait for its WAL flush at commit.
+                type_oids = fetch_column_types(cur, staging_table, columns, setup_sql=f"""
+                    SET LOCAL synchronous_commit = off;
+                    CREATE TEMP TABLE "{staging_table}"
+                    (LIKE "{table_name}" INCLUDING DEFAULTS)
+                    ON COMMIT DROP;
+                """)
+                if all(oid in PG_BINARY_TYPES for oid in type_oids):
+                    output = DataFrameBinaryStream(df, type_oids, columns)
+                    copy_sql = f"""
+                        COPY "{staging_table}" ({columns_str})
+                        FROM STDIN
+                        WITH (FORMAT BINARY);
+                    """
+                else:
+                    output = DataFrameCSVStream(df, columns)
+                    copy_sql = f"""
+                        COPY "{staging_table}" ({columns_str})
+                        FROM STDIN
+                        WITH (
+                            FORMAT CSV,
+                            DELIMITER ',',
+                            NULL ''
+                        );
+                    """
+                cur.copy_expert(copy_sql, output, size=1 << 20)
+
+                # Anti-join on epoch: works whether or not the target has a unique constraint
+                cur.execute(f"""
+                    INSERT INTO "{table_name}" ({columns_str})
+                    SELECT DISTINCT ON (t."epoch") {staged_columns_str}
+                    FROM "{staging_table}" t
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM "{table_name}" o WHERE o."epoch" = t."epoch"
+                    )
+                    ORDER BY t."epoch";
+                """)
+                inserted = cur.rowcount
+                if before_commit is not None:
+                    before_commit()
                 conn.commit()
             except Exception as e:
                 conn.rollback()
                 raise e
+    return inserted
+
+def split_by_epoch(df, n_shards):
+    """
+    Split df into up to n_shards frames over disjoint epoch ranges (quantile cut points).
+    Every epoch value lands in exactly one shard, so concurrent staging merges can
+    never insert the same epoch twice.
+    """
+    epochs = df["epoch"].to_numpy(dtype="datetime64[ns]").view("int64")
+    cut_points = np.unique(np.quantile(epochs, np.linspace(0, 1, n_shards + 1)[1:-1]).astype(np.int64))
+    shard_ids = np.searchsorted(cut_points, epochs, side="right")
+    return [df[shard_ids == shard] for shard in range(len(cut_points) + 1) if (shard_ids == shard).any()]
+
+def copy_using_psycopg2(df, table_name="omni_data", columns=None, max_workers=None, min_rows_per_shard=250_000):
+    """
+    Bulk-load the DataFrame into PostgreSQL using psycopg2 COPY command.
+    Large loads run as concurrent epoch shards. Returns the number of rows inserted.
+    """
+    if columns is None:
+        columns = ["epoch"] + [c for c in df.columns if c != "epoch"]
+    if max_workers is None:
+        max_workers = min(8, os.cpu_count() or 1)
+    n_shards = max(1, min(max_workers, len(df) // min_rows_per_shard))
+    if n_shards == 1:
+        return copy_shard(df, table_name, columns)
+
+    shards = split_by_epoch(df, n_shards)  # ascending epoch ranges
+    finished = [threading.Event() for _ in shards]
+    committed = [False] * len(shards)
+
+    def load_shard(i):
+        def wait_for_previous_shard():
+            # Hold this shard's open transaction until the older shard has committed
+            if i > 0:
+                finished[i - 1].wait()
+                if not committed[i - 1]:
+                    raise RuntimeError(f"Epoch shard {i} rolled back: an earlier shard failed")
+        try:
+            inserted = copy_shard(shards[i], table_name, columns, before_commit=wait_for_previous_shard)
+            committed[i] = True
+            return inserted
+        finally:
+            finished[i].set()
+
+    # COPY is I/O-bound and psycopg2 releases the GIL while waiting on the server;
+    # one thread per shard, since every shard waits on its predecessor before committing
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        futures = [executor.submit(load_shard, i) for i in range(len(shards))]
+        concurrent.futures.wait(futures)
+    for future in futures:
+        if future.exception() is not None:
+            # The oldest failure is the root cause; the shards before it are committed
+            raise future.exception()
+    return sum(future.result() for future in futures)
 
 def main():
     omni_folder = "SpaceWeather"
@@ -168,15 +481,16 @@ def main():
     if combined_df.empty:
         print("No data to insert.")
         return
-    print(f"Total rows combined after duplicate removal: {len(combined_df)}")
-
-    # Filter out epochs already in DB
-    existing_epochs = fetch_existing_epochs()
-    if existing_epochs:
-        print(f"Found {len(existing_epochs)} existing epochs. Filtering new data...")
+    print(f"Total rows combined: {len(combined_df)}")
 
-    new_df = combined_df[~combined_df["epoch"].isin(existing_epochs)]
-    new_df.sort_values("epoch", inplace=True)
+    # OMNI data is append-mostly: only ship rows newer than the latest stored epoch.
+    # Any overlap that remains is skipped server-side by the staging merge.
+    latest_epoch = fetch_latest_epoch()
+    if latest_epoch is not None:
+        print(f"Latest epoch in DB: {latest_epoch}. Filtering new data...")
+        new_df = combined_df[combined_df["epoch"] > pd.Timestamp(latest_epoch)]
+    else:
+        new_df = combined_df
     print(f"Total new rows to insert: {len(new_df)}")
     
     if new_df.empty:
@@ -184,8 +498,8 @@ def main():
         return
     
     print("Performing fast bulk copy into PostgreSQL (with quoted column names)...")
-    copy_using_psycopg2(new_df, table_name="omni_data")
-    print("✅ OMNI data inserted into 'omni_data' table using COPY and quoted columns.")
+    inserted = copy_using_psycopg2(new_df, table_name="omni_data")
+    print(f"✅ {inserted} new OMNI rows inserted into 'omni_data' table via COPY + staging merge.")
 
 if __name__ == "__main__":
     main()